@@ -1,4 +1,4 @@
-#  A fun little project to simulate an elevator system through the use of multithreading in python
+#  A fun little project to simulate an elevator system on a single asyncio event loop in python
 #  ===============================================================================================
 #  Context:  Two elevators will be operational in the simulation, and they will mimic a real-life
 #            elevator through the following:
@@ -8,143 +8,181 @@
 #  ===============================================================================================
 #  Version #1 : Simulating the process with a single elevator (ele_A)
 
-import threading
-import time
-from queue import Queue
+import asyncio
+import logging
+import os
+import stat
+import sys
 from enum import Enum
+from collections import namedtuple
+
+log = logging.getLogger("elev")
+
+
+class _Quit:
+    """
+    Type of the _QUIT sentinel put on the queue to stop the elevator task
+    """
+
+
+_QUIT = _Quit()
+
+# Parsed user request: direction is a Status, floors and capacity are ints
+Signal = namedtuple("Signal", "direction dest cap start")
+
+# Input prompt and accepted directions, built once for create_signal
+_PROMPT = "Enter UP/DOWN, destination floor, capacity, starting floor or 'QUIT' to exit: "
+_VALID_DIRS = frozenset(("UP", "DOWN"))
+
+
+class Status(Enum):
+    """
+    Enumuerate Status in Elevator Class : Is there a way to use these values effectively?
+    """
+    REST = 0
+    UP = 1
+    DOWN = 2
+    MAINTENANCE = 3
+
+
+# Lookup of Status names for set_status
+_STATUS_TBL = {s.name: s for s in Status}
+
+
+class ElevatorState:
+    """
+    Fields that change while the elevator runs, kept apart from the fixed
+    configuration on Elevator so scans over many elevators touch only these
+    """
+    __slots__ = ("current_floor", "status", "current_capacity")
+
+    def __init__ (self):
+        self.current_floor = 1
+        self.status = Status.REST
+        self.current_capacity = 0
+
 
 class Elevator:
-    def __init__ (self, id: str, capacity: int, floor: int):
+    __slots__ = ("id", "capacity", "floor", "step_delay", "state")
+
+    def __init__ (self, id: str, capacity: int, floor: int, step_delay: float = 2.0):
         self.id = id  # Can consider setting auto name
         self.capacity = capacity
-        self.current_capacity = 0
-        self.status = Status.REST
         self.floor = floor
-        self.current_floor = 1
+        self.step_delay = step_delay  # Seconds to move one floor, 0 to disable
+        self.state = ElevatorState()
 
     def set_capacity(self, capacity: int):
         self.capacity = capacity
     
     def set_current_capacity(self, current_capacity: int):
-        self.current_capacity = current_capacity
+        self.state.current_capacity = current_capacity
 
     def set_status(self, status: str):
         """
         Convert string to Status Enum
         """
-        match(status):
-            case "UP":
-                self.status = Status.UP
-            case "DOWN":
-                self.status = Status.DOWN
-            case "REST":
-                self.status = Status.REST
-            case "MAINTENANCE":
-                self.status = Status.MAINTENANCE
-            case _:
-                print ("Unexpected Error in set_status")
-                print ("Input data:", str(status))
+        new_status = _STATUS_TBL.get(status)
+        if new_status is None:
+            print ("Unexpected Error in set_status")
+            print ("Input data:", str(status))
+        else:
+            self.state.status = new_status
     
     def set_floor(self, floor: int):
         self.floor = floor
     
     def set_current_floor(self, current_floor: int):
-        self.current_floor = current_floor
+        self.state.current_floor = current_floor
 
     def move_up(self):
-        self.current_floor += 1
+        self.state.current_floor += 1
         # Temporarily show status each time elevator moves
         self.show_status()
 
     def move_down(self):
-        self.current_floor -= 1
+        self.state.current_floor -= 1
         # Temporarily show status each time elevator moves
         self.show_status()
 
-    def show_status(self):
-        print ("----------------------------")
-        print ("ID       : ", self.id)
-        print ("Floor    : ", self.current_floor)
-        print ("Capacity : ", self.current_capacity)
-        print ("Status   : ", self.status.name)
-        print ("----------------------------")
+    async def move_to(self, target_floor: int):
+        """
+        Move floor by floor to target_floor, setting the direction once up front
+        """
+        state = self.state
+        delta = target_floor - state.current_floor
+        if delta > 0:
+            state.status = Status.UP
+            step = self.move_up
+        elif delta < 0:
+            state.status = Status.DOWN
+            step = self.move_down
+        else:
+            return
+
+        step_delay = self.step_delay
+        for _ in range(abs(delta)):
+            step()
+            if step_delay:
+                await asyncio.sleep(step_delay)  # Simulate some processing time
+
+    def show_status(self, level: int = logging.DEBUG):
+        # Per-floor calls use DEBUG, so they cost nothing at the default INFO level
+        state = self.state
+        log.log(
+            level,
+            "----------------------------\n"
+            "ID       :  %s\n"
+            "Floor    :  %s\n"
+            "Capacity :  %s\n"
+            "Status   :  %s\n"
+            "----------------------------",
+            self.id, state.current_floor, state.current_capacity, state.status.name,
+        )
     
 
-class Status(Enum):
+def create_signal(elevator: Elevator, line: str) -> Signal | _Quit | None:
     """
-    Enumuerate Status in Elevator Class : Is there a way to use these values effectively?
+    Creates signal for elevator to respond from a single line of input:
+    DIRECTION DEST_FLOOR CAPACITY START_FLOOR
+    Returns the _QUIT sentinel if the line is QUIT
+    Returns None (after printing why) if the line is invalid
     """
-    REST = 0
-    UP = 1
-    DOWN = 2
-    MAINTENANCE = 3      
+    fields = line.split()
 
+    if len(fields) == 1 and fields[0].upper() == "QUIT":
+        return _QUIT
 
-def create_signal(elevator: Elevator) -> tuple:
-    """
-    Creates signal for elevator to respond -> Look to simplify?
-    """
-    # Reset after each input
-    invalid_direction = True
-    invalid_dest_floor = True
-    invalid_capacity = True
-    invalid_start_floor = True
+    try:
+        direction_input, dest_floor_input, capacity_input, start_floor_input = fields
+        dest_floor = int(dest_floor_input)
+        capacity = int(capacity_input)
+        start_floor = int(start_floor_input)
+    except ValueError:
+        print ("Invalid input. Expected: DIRECTION DEST_FLOOR CAPACITY START_FLOOR")
+        return None
 
     # Set direction of elevator
-    while invalid_direction:
-        direction_input = input("Enter UP or DOWN or 'QUIT' to exit: ")
-        if direction_input.upper() == "QUIT":
-            return "QUIT"
-        if direction_input.upper() in ["UP", "DOWN"]:
-            invalid_direction = False
-        else:
-            print ("Invalid direction.")
-
-    # Set destination floor
-    while invalid_dest_floor:
-        dest_floor_input = input("Enter destination floor number or 'QUIT' to exit: ")
-        # Floor must be within range set in Elevator Class
-        try:
-            if (dest_floor_input.upper() == "QUIT"):
-                return "QUIT"
-            elif (0 < int(dest_floor_input) <= elevator.floor):
-                invalid_dest_floor = False
-            else:
-                print ("Invalid floor.")
-        except ValueError:
-            print ("Invalid floor.")
-        
-    while invalid_capacity:
-        capacity_input = input("Enter capacity or 'QUIT' to exit: ")
-        # Capacity must be within range of capacity elevator can hold: This might cause issues when multithreading?
-        try:
-            if (capacity_input.upper() == "QUIT"):
-                return "QUIT"
-            elif 0 <= int(capacity_input) <= (elevator.capacity - elevator.current_capacity):
-                invalid_capacity = False
-            else:
-                print ("Invalid capacity.")
-        except ValueError:
-            print ("Invalid capacity.")
-    
-    # Set starting floor
-    while invalid_start_floor:
-        start_floor_input = input("Enter starting floor number or 'QUIT' to exit: ")
-        # Floor must be within range set in Elevator Class
-        try:
-            if (start_floor_input.upper() == "QUIT"):
-                return "QUIT"
-            elif (0 < int(start_floor_input) <= elevator.floor):
-                invalid_start_floor = False
-            else:
-                print ("Invalid floor.")
-        except ValueError:
-            print ("Invalid floor.")
-    
-    return (direction_input, dest_floor_input, capacity_input, start_floor_input)
+    direction_input = direction_input.upper()
+    if direction_input not in _VALID_DIRS:
+        print ("Invalid direction.")
+        return None
 
+    # Floors must be within range set in Elevator Class
+    if not (0 < dest_floor <= elevator.floor and 0 < start_floor <= elevator.floor):
+        print ("Invalid floor.")
+        return None
 
-def sanity_check(elevator: Elevator, direction: str, dest_floor: int, capacity: int) -> bool:
+    # Capacity must be within range of capacity elevator can hold
+    if not (0 <= capacity <= (elevator.capacity - elevator.state.current_capacity)):
+        print ("Invalid capacity.")
+        return None
+
+    direction = Status.UP if direction_input == "UP" else Status.DOWN
+    return Signal(direction, dest_floor, capacity, start_floor)
+
+
+def sanity_check(elevator: Elevator, direction: Status, dest_floor: int, capacity: int) -> bool:
     """
     Checks:
     1: Current capacity + new capacity <= elevator max capacity
@@ -152,118 +190,153 @@ def sanity_check(elevator: Elevator, direction: str, dest_floor: int, capacity:
     3: If DOWN:  current_floor > dest_floor
     Ignore commands if check fails
     """
-    if (elevator.current_capacity + capacity) <= elevator.capacity:
-        if direction == "UP" and dest_floor > elevator.current_floor:
+    if (elevator.state.current_capacity + capacity) <= elevator.capacity:
+        if direction is Status.UP and dest_floor > elevator.state.current_floor:
             return True
         
-        if direction == "DOWN" and dest_floor < elevator.current_floor:
+        if direction is Status.DOWN and dest_floor < elevator.state.current_floor:
             return True
     
     return False
 
 
-def listen_for_input(elevator: Elevator, input_queue: Queue):
+async def open_stdin() -> tuple:
+    """
+    Wrap stdin in a StreamReader served by the event loop's selector, so a
+    pending read can be cancelled instead of blocking a thread in input()
+    Returns (reader, close); close is None if stdin was read up front
+    """
+    if sys.stdin is None:
+        raise RuntimeError("lost sys.stdin")
+
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    fd = sys.stdin.fileno()
+    mode = os.fstat(fd).st_mode
+
+    # Only pipes, sockets and terminals can be watched by the selector
+    if stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or os.isatty(fd):
+        # The transport makes stdin non-blocking, which on a terminal is shared
+        # with stdout and the parent shell, so close() restores the original flag
+        blocking = os.get_blocking(fd)
+
+        # Use a duplicate so closing the transport leaves fd 0 open
+        pipe = os.fdopen(os.dup(fd), "rb", buffering=0)
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), pipe
+        )
+
+        def close():
+            transport.close()
+            os.set_blocking(fd, blocking)
+    else:
+        # Files and devices such as /dev/null never block, so read them up front
+        reader.feed_data(sys.stdin.buffer.read())
+        reader.feed_eof()
+        close = None
+    return reader, close
+
+
+async def listen_for_input(elevator: Elevator, input_queue: asyncio.Queue):
     """
     Listen for elevator input from users
     Takes in DIRECTION, FLOOR, CAPACITY
     """
-    elevator_running = True
+    close_stdin = None
     
-    while elevator_running:
-        signal = create_signal(elevator)
+    try:
+        stdin, close_stdin = await open_stdin()
+        stdin_encoding = sys.stdin.encoding or "utf-8"
 
-        # Signal either an array or "QUIT"
-        input_queue.put(signal)
+        while True:
+            print (_PROMPT, end="", flush=True)
+            line = await stdin.readline()
 
-        if signal == "QUIT":
-            elevator_running = False
+            # End of input is treated the same as QUIT
+            if not line:
+                line = b"QUIT"
+
+            # Decode like input() would; bad bytes fail validation as an invalid line
+            signal = create_signal(elevator, line.decode(stdin_encoding, errors="replace"))
+            if signal is None:
+                continue
+
+            # Signal either a Signal or _QUIT
+            input_queue.put_nowait(signal)
+
+            if signal is _QUIT:
+                break
+    except BaseException:
+        # Make sure the elevator task still stops if input fails or is cancelled
+        input_queue.put_nowait(_QUIT)
+        raise
+    finally:
+        if close_stdin is not None:
+            close_stdin()
         
 
-def process_elevator(elevator: Elevator, input_queue: Queue):
+async def process_elevator(elevator: Elevator, input_queue: asyncio.Queue):
     """
     Elevator function to process input
     """
-    elevator_running = True
+    while True:
+        # Wait until the input task puts a signal in the queue
+        signal = await input_queue.get()
 
-    while elevator_running:
-        # Check for input every 0.5 seconds
-        if input_queue.empty():
-            time.sleep(0.5)
-            continue
-        
-        signal = input_queue.get()
-
-        # Program ends if receives "QUIT"
-        if signal == "QUIT":
-            elevator_running = False
+        # Program ends if receives _QUIT
+        if signal is _QUIT:
             return
 
-        # Set up variables from input
-        direction = signal[0].upper()
-        dest_floor = int(signal[1])
-        capacity = int(signal[2])
-        start_floor = int(signal[3])
+        # Set up variables from input (already parsed by create_signal)
+        direction, dest_floor, capacity, start_floor = signal
 
-        print ("Received Signal : ", signal)
-        print ("Moving to floor : ", start_floor)
+        log.info("Received Signal :  %s", signal)
+        log.info("Moving to floor :  %d", start_floor)
 
         # Elevator will respond by moving to the signaled start floor regardless of sanity check
-        if (elevator.current_floor - start_floor > 0):
-            elevator.set_status("DOWN")
-        elif (elevator.current_floor - start_floor < 0):
-            elevator.set_status("UP")
-        else:
-            pass
+        await elevator.move_to(start_floor)
         
-        while elevator.current_floor != start_floor:
-            if elevator.status == Status.UP:
-                elevator.move_up()
-                time.sleep(2)  # Simulate some processing time
-
-            elif elevator.status == Status.DOWN:
-                elevator.move_down()
-                time.sleep(2)  # Simulate some processing time
-        
-        print ("Arrived at floor : ", start_floor)
-        elevator.set_status("REST")
+        log.info("Arrived at floor :  %d", start_floor)
         
         # Sanity check on values before executing
         if not sanity_check(elevator, direction, dest_floor, capacity):
-            print ("Ignored command. Failed sanity check.")
+            log.info("Ignored command. Failed sanity check.")
+            elevator.state.status = Status.REST
             continue
 
         # Start response to elevator signal
-        elevator.current_capacity += capacity
-        print (capacity, "passengers boarded", elevator.id, ".")
-
-        if direction == "UP" or direction == "DOWN":
-            elevator.set_status(direction)
-        else:
-            print ("Unexpected Error in processing elevator UP or DOWN")
-            print ("Current signal:", signal)
-
-        # Move elevator to floor
-        while elevator.current_floor != dest_floor:
-            if elevator.status == Status.UP:
-                elevator.move_up()
-                time.sleep(2) # Simulate some processing time
-
-            elif elevator.status == Status.DOWN:
-                elevator.move_down()
-                time.sleep(2) # Simulate some processing time
+        elevator.state.current_capacity += capacity
+        log.info("%d passengers boarded %s.", capacity, elevator.id)
 
-            else:
-                print("Unexpected error while moving elevator.")
-                break
+        # Move elevator to floor: move_to sets the UP/DOWN status itself
+        await elevator.move_to(dest_floor)
         
         # Once done, go back to rest
-        print ("Floor reached.")
-        elevator.set_status("REST")
+        log.info("Floor reached.")
+        elevator.state.status = Status.REST
         
         # Passengers leave the elevator
-        elevator.current_capacity -= capacity
-        print (capacity, "passengers left", elevator.id, ".")
-        elevator.show_status()
+        elevator.state.current_capacity -= capacity
+        log.info("%d passengers left %s.", capacity, elevator.id)
+        elevator.show_status(logging.INFO)
+
+
+async def run_elevator(elevator: Elevator):
+    """
+    Run user input and elevator operation as two tasks on one event loop
+    """
+    input_queue = asyncio.Queue()
+    input_task = asyncio.create_task(listen_for_input(elevator, input_queue))
+
+    try:
+        await process_elevator(elevator, input_queue)
+    except BaseException:
+        # Stop waiting on stdin so a failed elevator doesn't hang the program
+        input_task.cancel()
+        raise
+
+    # Re-raise any error from the input task
+    await input_task
 
 
 def __main__():
@@ -271,28 +344,36 @@ def __main__():
     max_capacity = 15
     max_floors = 10
 
-    # Initialization
-    ele_A = Elevator(id="ELEVATOR_A", capacity=max_capacity, floor=max_floors)
-    ele_A.show_status()
+    # Seconds to move one floor; a bad or negative value falls back to 2.0
+    step_input = os.environ.get("ELEV_STEP", "2.0")
+    try:
+        step_delay = float(step_input)
+        if not 0 <= step_delay < float("inf"):
+            raise ValueError(step_input)
+    except ValueError:
+        print ("Unknown ELEV_STEP:", step_input, "- using 2.0")
+        step_delay = 2.0
+
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+
+    # DEBUG shows the elevator status on every floor, INFO only per command
+    # Only the "elev" logger is changed so asyncio's own logging stays quiet
+    log_level = os.environ.get("ELEV_LOG_LEVEL", "INFO").upper()
+    try:
+        log.setLevel(log_level)
+    except ValueError:
+        print ("Unknown ELEV_LOG_LEVEL:", log_level, "- using INFO")
+        log.setLevel(logging.INFO)
 
-    # Set queue for multihreading between elevator operation and user input
-    input_queue = Queue()
+    # Initialization
+    ele_A = Elevator(id="ELEVATOR_A", capacity=max_capacity, floor=max_floors, step_delay=step_delay)
+    ele_A.show_status(logging.INFO)
 
     # For future implementation
     #ele_B = Elevator("ELEVATOR_B", capacity=max_capacity, floor=max_floors)
     #ele_B.show_status()
 
-    # Creating threads
-    input_thread = threading.Thread(target=listen_for_input, args=(ele_A, input_queue))
-    processing_thread = threading.Thread(target=process_elevator, args=(ele_A, input_queue))
-
-    # Starting threads
-    input_thread.start()
-    processing_thread.start()
-
-    # Joining threads to wait for them to finish
-    input_thread.join()
-    processing_thread.join()
+    asyncio.run(run_elevator(ele_A))
 
     print ("Test Done.")
 